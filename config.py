@@ -15,10 +15,32 @@ Optional:
 """
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Every setting .env.example defines; the .env file is only skipped when all
+# of them are already set in the environment
+_ENV_KEYS = (
+    "ORGO_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "ORGO_COMPUTER_ID",
+    "EMAIL_SERVICE_EMAIL",
+    "EMAIL_SERVICE_PASSWORD",
+    "PAYMENT_SERVICE_EMAIL",
+    "PAYMENT_SERVICE_PASSWORD",
+    "SEARCH_KEYWORDS",
+)
+
+# Load environment variables from .env file (only if needed)
+if not all(key in os.environ for key in _ENV_KEYS):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+# Snapshot the environment once so settings below are read from a plain dict
+_ENV = os.environ.copy()
+
+
+def get_env(key, default=None):
+    """Look up a setting from the environment snapshot taken at import."""
+    return _ENV.get(key, default)
 
 # =============================================================================
 # REQUIRED API KEYS
@@ -26,11 +48,11 @@ load_dotenv()
 
 # Orgo API key - provides cloud desktop infrastructure
 # Get yours at https://orgo.ai (free tier: 2 concurrent computers)
-ORGO_API_KEY = os.getenv("ORGO_API_KEY")
+ORGO_API_KEY = _ENV.get("ORGO_API_KEY")
 
 # Anthropic API key - powers Claude's computer use capabilities
 # Get yours at https://console.anthropic.com
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+ANTHROPIC_API_KEY = _ENV.get("ANTHROPIC_API_KEY")
 
 # =============================================================================
 # ORGO COMPUTER SETTINGS (Optional)
@@ -39,7 +61,7 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 # Reuse an existing computer instance instead of creating a new one
 # This helps maintain login sessions between runs
 # Leave empty to create a new computer each time
-ORGO_COMPUTER_ID = os.getenv("ORGO_COMPUTER_ID", "")
+ORGO_COMPUTER_ID = _ENV.get("ORGO_COMPUTER_ID", "")
 
 # =============================================================================
 # EMAIL SERVICE CREDENTIALS
@@ -47,8 +69,8 @@ ORGO_COMPUTER_ID = os.getenv("ORGO_COMPUTER_ID", "")
 # These are used by Claude to log into your email service via browser
 # Default: Zoho Mail (change for Gmail, Outlook, etc.)
 
-EMAIL_SERVICE_EMAIL = os.getenv("EMAIL_SERVICE_EMAIL")
-EMAIL_SERVICE_PASSWORD = os.getenv("EMAIL_SERVICE_PASSWORD")
+EMAIL_SERVICE_EMAIL = _ENV.get("EMAIL_SERVICE_EMAIL")
+EMAIL_SERVICE_PASSWORD = _ENV.get("EMAIL_SERVICE_PASSWORD")
 
 # =============================================================================
 # PAYMENT SERVICE CREDENTIALS  
@@ -56,8 +78,8 @@ EMAIL_SERVICE_PASSWORD = os.getenv("EMAIL_SERVICE_PASSWORD")
 # These are used by Claude to log into your payment service via browser
 # Default: Stripe (change for PayPal, Square, etc.)
 
-PAYMENT_SERVICE_EMAIL = os.getenv("PAYMENT_SERVICE_EMAIL")
-PAYMENT_SERVICE_PASSWORD = os.getenv("PAYMENT_SERVICE_PASSWORD")
+PAYMENT_SERVICE_EMAIL = _ENV.get("PAYMENT_SERVICE_EMAIL")
+PAYMENT_SERVICE_PASSWORD = _ENV.get("PAYMENT_SERVICE_PASSWORD")
 
 # =============================================================================
 # SEARCH KEYWORDS
@@ -65,8 +87,9 @@ PAYMENT_SERVICE_PASSWORD = os.getenv("PAYMENT_SERVICE_PASSWORD")
 # Keywords to search for in emails (comma-separated in .env)
 # Claude will look for emails containing any of these keywords
 
-SEARCH_KEYWORDS_STR = os.getenv("SEARCH_KEYWORDS", "refund,refund request,refund please")
-SEARCH_KEYWORDS = [keyword.strip().lower() for keyword in SEARCH_KEYWORDS_STR.split(",")]
+SEARCH_KEYWORDS_STR = _ENV.get("SEARCH_KEYWORDS", "refund,refund request,refund please")
+# Duplicates are dropped; the order from .env is kept for the prompt
+SEARCH_KEYWORDS = tuple(dict.fromkeys(keyword.strip().lower() for keyword in SEARCH_KEYWORDS_STR.split(",")))
 
 # =============================================================================
 # DISPLAY SETTINGS
@@ -81,19 +104,34 @@ DISPLAY_HEIGHT = 800
 # VALIDATION
 # =============================================================================
 
+# Set once validate_config() succeeds so later calls return immediately
+_CONFIG_VALIDATED = False
+
 def validate_config():
     """
     Validate that required configuration is present.
     
+    The API keys are checked as they were when this module was imported, and
+    libraries like orgo read them from os.environ directly. They must be set in
+    the environment (or .env) before config is imported; changing os.environ
+    afterwards does not affect validation.
+    
+    The result is cached after the first successful call, so creating many
+    agents only validates once.
+    
     Raises:
         ValueError: If required API keys are missing
     """
-    missing = []
-    
-    if not ORGO_API_KEY:
-        missing.append("ORGO_API_KEY")
-    if not ANTHROPIC_API_KEY:
-        missing.append("ANTHROPIC_API_KEY")
+    global _CONFIG_VALIDATED
+    if _CONFIG_VALIDATED:
+        return True
+
+    missing = tuple(
+        key for key, value in (
+            ("ORGO_API_KEY", ORGO_API_KEY),
+            ("ANTHROPIC_API_KEY", ANTHROPIC_API_KEY),
+        ) if not value
+    )
     
     if missing:
         raise ValueError(
@@ -101,8 +139,5 @@ def validate_config():
             f"Please create a .env file with these values. See .env.example for reference."
         )
     
-    # Set environment variables for libraries that need them
-    os.environ["ORGO_API_KEY"] = ORGO_API_KEY
-    os.environ["ANTHROPIC_API_KEY"] = ANTHROPIC_API_KEY
-    
+    _CONFIG_VALIDATED = True
     return True
@@ -17,18 +17,117 @@ How it works:
 
 To customize for your use case:
 1. Modify WORKFLOW_CONFIG below with your services
-2. Update build_workflow_prompt() with your specific steps
+2. Update WORKFLOW_PROMPT with your specific steps
 3. Update config.py with your credentials
 """
 
 import os
 import sys
 import logging
-import argparse
+import logging.handlers
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from string import Template
+from typing import TYPE_CHECKING, NamedTuple, NoReturn, Optional
+
+# =============================================================================
+# COMMAND LINE ARGUMENTS
+# =============================================================================
+# Defined before the config import below so --help and usage errors exit
+# without reading .env
+
+_USAGE = """usage: cua_agent.py [-h] [--computer-id COMPUTER_ID] [--dry-run] [--verbose]
+
+CUA Template - Automate browser workflows with Claude
+
+options:
+  -h, --help            show this help message and exit
+  --computer-id COMPUTER_ID
+                        Reuse an existing Orgo computer instance by ID
+  --dry-run             Run in test mode - describe actions without performing them
+  --verbose             Enable detailed debug logging
+
+Examples:
+  python cua_agent.py                     Run the workflow
+  python cua_agent.py --dry-run           Test without taking actions  
+  python cua_agent.py --computer-id abc   Reuse existing computer
+  python cua_agent.py --verbose           Show detailed debug logs"""
+
+
+_LONG_FLAGS = ("--help", "--computer-id", "--dry-run", "--verbose")
+
+
+def _usage_error(message: str) -> NoReturn:
+    """Print usage and an error to stderr and exit, like argparse does."""
+    print(_USAGE.split("\n", 1)[0], file=sys.stderr)
+    print(f"cua_agent.py: error: {message}", file=sys.stderr)
+    sys.exit(2)
+
+
+def _resolve_flag(arg: str) -> str:
+    """Expand an unambiguous abbreviation like --dry to its full flag name."""
+    if arg in _LONG_FLAGS:
+        return arg
+    matches = [flag for flag in _LONG_FLAGS if flag.startswith(arg)]
+    if len(matches) > 1:
+        _usage_error(f"ambiguous option: {arg} could match {', '.join(matches)}")
+    return matches[0] if matches else arg
+
+
+def _parse_args(args: list[str]) -> tuple[Optional[str], bool, bool]:
+    """
+    Parse command line flags into (computer_id, dry_run, verbose).
+    
+    Accepts the same forms argparse did: abbreviated flags (--dry, --comp X),
+    --computer-id=X, and a bare "--" ending the options.
+    """
+    computer_id = None
+    dry_run = False
+    verbose = False
+    
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        value = None
+        if arg == "--":
+            # This CLI takes no positional arguments
+            if i + 1 < len(args):
+                _usage_error(f"unrecognized arguments: {' '.join(args[i + 1:])}")
+            break
+        if arg.startswith("--"):
+            arg, sep, value = arg.partition("=")
+            arg = _resolve_flag(arg)
+            if not sep:
+                value = None
+            elif arg != "--computer-id" and arg in _LONG_FLAGS:
+                _usage_error(f"argument {arg}: ignored explicit argument '{value}'")
+        
+        if arg in ("-h", "--help"):
+            print(_USAGE)
+            sys.exit(0)
+        elif arg == "--dry-run":
+            dry_run = True
+        elif arg == "--verbose":
+            verbose = True
+        elif arg == "--computer-id":
+            if value is None:
+                i += 1
+                if i >= len(args) or args[i].startswith("-"):
+                    _usage_error("argument --computer-id: expected one argument")
+                value = args[i]
+            computer_id = value
+        else:
+            _usage_error(f"unrecognized arguments: {args[i]}")
+        i += 1
+    
+    return computer_id, dry_run, verbose
+
+
+# Exit early on --help or bad arguments; main() parses them again
+if __name__ == "__main__":
+    _parse_args(sys.argv[1:])
 
-from orgo import Computer
 from config import (
     validate_config,
     SEARCH_KEYWORDS,
@@ -41,47 +140,251 @@ from config import (
     ORGO_COMPUTER_ID,
 )
 
+if TYPE_CHECKING:
+    from orgo import Computer
+
 # =============================================================================
 # WORKFLOW CONFIGURATION - Customize this for your use case!
 # =============================================================================
 
-WORKFLOW_CONFIG = {
+class WorkflowConfig(NamedTuple):
+    """Settings that describe the services and actions in your workflow."""
+
     # Email service settings (where requests come from)
-    "email_service": "Zoho Mail",           # Name of your email service
-    "email_url": "mail.zoho.com",           # URL to navigate to
-    "email_bookmark": "Zoho Mail",          # Firefox bookmark name (optional)
+    email_service: str                      # Name of your email service
+    email_url: str                          # URL to navigate to
+    email_bookmark: str                     # Firefox bookmark name (optional)
     
     # Payment service settings (where actions are taken)
-    "payment_service": "Stripe",            # Name of your payment service
-    "payment_url": "dashboard.stripe.com",  # URL to navigate to
-    "payment_bookmark": "Stripe",           # Firefox bookmark name (optional)
+    payment_service: str                    # Name of your payment service
+    payment_url: str                        # URL to navigate to
+    payment_bookmark: str                   # Firefox bookmark name (optional)
     
     # Action settings
-    "action_name": "Refund payment",        # Button/menu text to click
-    "action_menu": "three dots",            # How to access the action (e.g., "three dots menu")
+    action_name: str                        # Button/menu text to click
+    action_menu: str                        # How to access the action (e.g., "three dots menu")
     
     # What to search for in emails
-    "search_keywords": SEARCH_KEYWORDS,     # Loaded from config.py
+    search_keywords: tuple[str, ...]
     
     # Time window for processing
-    "hours_lookback": 24,                   # Only process requests from last N hours
-}
+    hours_lookback: int                     # Only process requests from last N hours
+
+
+WORKFLOW_CONFIG = WorkflowConfig(
+    # Email service settings (where requests come from)
+    email_service="Zoho Mail",
+    email_url="mail.zoho.com",
+    email_bookmark="Zoho Mail",
+    
+    # Payment service settings (where actions are taken)
+    payment_service="Stripe",
+    payment_url="dashboard.stripe.com",
+    payment_bookmark="Stripe",
+    
+    # Action settings
+    action_name="Refund payment",
+    action_menu="three dots",
+    
+    # What to search for in emails
+    search_keywords=SEARCH_KEYWORDS,        # Loaded from config.py
+    
+    # Time window for processing
+    hours_lookback=24,
+)
+
+# =============================================================================
+# WORKFLOW PROMPT - This is what Claude will execute
+# =============================================================================
+# Modify WORKFLOW_PROMPT to change what the agent does. Everything except the
+# $current_time, $lookback_time and $dry_run_note placeholders is filled in
+# once at import, so building a prompt per run is a single substitute() call.
+# A literal "$" written in the template text must be doubled as "$$".
+
+def _escape_dollars(value: str) -> str:
+    """Escape "$" so values baked into the template survive substitute()."""
+    return value.replace("$", "$$")
+
+
+_BAR = "=" * 60
+
+# WORKFLOW_CONFIG with "$" escaped in every value, for baking into the template
+_ESCAPED = WorkflowConfig._make(_escape_dollars(str(value)) for value in WORKFLOW_CONFIG)
+
+_EMAIL_CREDS_BLOCK = _escape_dollars(
+    f"\n   - Email: {EMAIL_SERVICE_EMAIL}\n   - Password: {EMAIL_SERVICE_PASSWORD}"
+    if EMAIL_SERVICE_EMAIL and EMAIL_SERVICE_PASSWORD
+    else " (check environment variables)"
+)
+
+_PAYMENT_CREDS_BLOCK = _escape_dollars(
+    f"\n   - Email: {PAYMENT_SERVICE_EMAIL}\n   - Password: {PAYMENT_SERVICE_PASSWORD}"
+    if PAYMENT_SERVICE_EMAIL and PAYMENT_SERVICE_PASSWORD
+    else " (check environment variables)"
+)
+
+_KEYWORDS_STR = _escape_dollars(", ".join(WORKFLOW_CONFIG.search_keywords))
+
+_DRY_RUN_NOTE = (
+    "[DRY RUN MODE] Do NOT actually click action buttons. "
+    "Instead, take screenshots and describe what you would do."
+)
+
+WORKFLOW_PROMPT = Template(f"""You are an automation agent tasked with processing requests.
+Current time: $current_time
+Only process requests from the last {_ESCAPED.hours_lookback} hours (since $lookback_time).
+
+{_BAR}
+WORKFLOW STEPS
+{_BAR}
+
+1. OPEN BROWSER
+   - Open Firefox browser (if not already open)
+   - Look for bookmarks for "{_ESCAPED.email_bookmark}" and "{_ESCAPED.payment_bookmark}"
+   - If bookmarks exist, you can use them for faster navigation
+
+2. GO TO EMAIL ({_ESCAPED.email_service})
+   - Navigate to: {_ESCAPED.email_url}
+   - Check if you're already logged in (look for inbox, profile icon, etc.)
+   - If NOT logged in, use these credentials:{_EMAIL_CREDS_BLOCK}
+   - Verify you're in the correct account
+
+3. SEARCH FOR REQUESTS
+   - Search for emails containing: {_KEYWORDS_STR}
+   - CRITICAL: Just type the search term and press Enter
+   - CRITICAL: Do NOT click dropdown suggestions that appear while typing
+   - CRITICAL: Only process emails from the last {_ESCAPED.hours_lookback} hours
+   - If no matching emails found, the task is complete - log "No requests found" and finish
+
+4. FOR EACH REQUEST FOUND (process one at a time):
+
+   a. EXTRACT INFORMATION
+      - Open the email
+      - Find the customer's email address (usually in "From" field or email body)
+      - Note any specific details mentioned (amounts, order numbers, etc.)
+   
+   b. GO TO PAYMENT SERVICE ({_ESCAPED.payment_service})
+      - Navigate to: {_ESCAPED.payment_url}
+      - Log in if needed using:{_PAYMENT_CREDS_BLOCK}
+      - Verify you're logged in
+   
+   c. FIND THE CUSTOMER
+      - Go to the Payments or Customers section
+      - Search for the customer by their email address
+      - Wait for results to load
+      - Verify you found the correct customer (email must match exactly)
+   
+   d. PERFORM THE ACTION
+      - Find the relevant transaction/payment
+      - Click the {_ESCAPED.action_menu} menu (usually ⋯ or ...)
+      - Click "{_ESCAPED.action_name}"
+      - Confirm the action if prompted
+      - Wait for success confirmation
+      - Take a screenshot to document the action
+   
+   e. RETURN TO EMAIL
+      - Go back to {_ESCAPED.email_service}
+      - Process the next request
+
+5. COMPLETION
+   - After all requests are processed, take a final screenshot
+   - Log a summary of actions taken
+   - Your task is complete
+
+{_BAR}
+IMPORTANT RULES
+{_BAR}
+
+- Process requests ONE AT A TIME (not in parallel)
+- Take screenshots after important steps for verification
+- If you encounter an error, take a screenshot and try to recover
+- If a customer is not found, skip and move to the next request
+- If an action was already performed, skip and move to the next
+- Be careful and methodical - accuracy over speed
+
+$dry_run_note
+
+Begin by opening the browser and starting the workflow.""")
 
 # =============================================================================
 # LOGGING SETUP
 # =============================================================================
 
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# The log file is opened on first write and records are written in batches;
+# errors (and process exit) flush the buffer immediately
+_file_handler = logging.FileHandler('cua_agent.log', delay=True)
+_file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+_buffered_file_handler = logging.handlers.MemoryHandler(
+    capacity=512,
+    flushLevel=logging.ERROR,
+    target=_file_handler,
+)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=_LOG_FORMAT,
     handlers=[
-        logging.FileHandler('cua_agent.log'),
+        _buffered_file_handler,
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
 
+_LOOKBACK_DELTA = timedelta(hours=WORKFLOW_CONFIG.hours_lookback)
+
+
+@lru_cache(maxsize=1)
+def _format_times(epoch_second: int) -> tuple[str, str]:
+    """Format current and lookback times, cached for calls within the same second."""
+    now = datetime.fromtimestamp(epoch_second)
+    lookback = now - _LOOKBACK_DELTA
+    return now.strftime("%Y-%m-%d %H:%M:%S"), lookback.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# =============================================================================
+# PROGRESS EVENT HANDLERS
+# =============================================================================
+# Each handler logs one type of event streamed back while Claude works
+
+def _on_text(event_data):
+    logger.info("Claude: %s", event_data)
+
+
+def _on_tool_use(event_data):
+    action = event_data.get('action', 'unknown')
+    logger.info("Action: %s", action)
+    if 'coordinate' in event_data:
+        logger.debug("  Click at: %s", event_data['coordinate'])
+
+
+def _on_thinking(event_data):
+    logger.debug("Thinking: %.200s...", event_data)  # Truncate long thoughts
+
+
+def _on_error(event_data):
+    logger.error("Error: %s", event_data)
+
+
+def _on_unknown(event_data):
+    pass
+
+
+_HANDLERS = {
+    "text": _on_text,
+    "tool_use": _on_tool_use,
+    "thinking": _on_thinking,
+    "error": _on_error,
+}
+
+
+def _progress_callback(event_type, event_data):
+    """Log what Claude is doing in real-time."""
+    _HANDLERS.get(event_type, _on_unknown)(event_data)
+
+
 # =============================================================================
 # MAIN AGENT CLASS
 # =============================================================================
@@ -94,6 +397,8 @@ class CUAAgent:
     the browser, completing tasks just like a human would.
     """
     
+    __slots__ = ("computer_id", "dry_run", "computer")
+    
     def __init__(self, computer_id: Optional[str] = None, dry_run: bool = False):
         """
         Initialize the CUA agent.
@@ -106,7 +411,7 @@ class CUAAgent:
         """
         self.computer_id = computer_id if computer_id is not None else ORGO_COMPUTER_ID
         self.dry_run = dry_run
-        self.computer: Optional[Computer] = None
+        self.computer: Optional["Computer"] = None
         
         # Validate that we have the required API keys
         validate_config()
@@ -118,6 +423,9 @@ class CUAAgent:
         Orgo provides cloud desktops with browsers that Claude can control.
         Free tier includes 2 concurrent computer instances.
         """
+        # Imported here so --help and config errors don't pay for loading the SDK
+        from orgo import Computer
+
         try:
             if self.computer_id:
                 logger.info(f"Connecting to existing computer: {self.computer_id}")
@@ -136,15 +444,13 @@ class CUAAgent:
     
     def get_time_strings(self) -> tuple[str, str]:
         """Get current time and lookback time as formatted strings."""
-        now = datetime.now()
-        lookback = now - timedelta(hours=WORKFLOW_CONFIG["hours_lookback"])
-        return now.strftime("%Y-%m-%d %H:%M:%S"), lookback.strftime("%Y-%m-%d %H:%M:%S")
+        return _format_times(int(time.time()))
     
     def build_workflow_prompt(self) -> str:
         """
         Build the detailed prompt that tells Claude exactly what to do.
         
-        This is the core of your automation - modify this to change the workflow.
+        This is the core of your automation - modify WORKFLOW_PROMPT to change the workflow.
         The prompt should be detailed and specific, like instructions for a new employee.
         
         CUSTOMIZATION TIP: 
@@ -153,102 +459,12 @@ class CUAAgent:
         - Add "CRITICAL" notes for steps that often go wrong
         """
         current_time, lookback_time = self.get_time_strings()
-        
-        # Get configuration values
-        config = WORKFLOW_CONFIG
-        keywords_str = ", ".join(config["search_keywords"])
-        
-        # Build credentials sections
-        email_creds = ""
-        if EMAIL_SERVICE_EMAIL and EMAIL_SERVICE_PASSWORD:
-            email_creds = f"\n   - Email: {EMAIL_SERVICE_EMAIL}\n   - Password: {EMAIL_SERVICE_PASSWORD}"
-        
-        payment_creds = ""
-        if PAYMENT_SERVICE_EMAIL and PAYMENT_SERVICE_PASSWORD:
-            payment_creds = f"\n   - Email: {PAYMENT_SERVICE_EMAIL}\n   - Password: {PAYMENT_SERVICE_PASSWORD}"
-        
-        # =====================================================================
-        # THE WORKFLOW PROMPT - This is what Claude will execute
-        # Modify this section to change what the agent does
-        # =====================================================================
-        
-        prompt = f"""You are an automation agent tasked with processing requests.
-Current time: {current_time}
-Only process requests from the last {config["hours_lookback"]} hours (since {lookback_time}).
-
-{"="*60}
-WORKFLOW STEPS
-{"="*60}
-
-1. OPEN BROWSER
-   - Open Firefox browser (if not already open)
-   - Look for bookmarks for "{config["email_bookmark"]}" and "{config["payment_bookmark"]}"
-   - If bookmarks exist, you can use them for faster navigation
-
-2. GO TO EMAIL ({config["email_service"]})
-   - Navigate to: {config["email_url"]}
-   - Check if you're already logged in (look for inbox, profile icon, etc.)
-   - If NOT logged in, use these credentials:{email_creds if email_creds else " (check environment variables)"}
-   - Verify you're in the correct account
-
-3. SEARCH FOR REQUESTS
-   - Search for emails containing: {keywords_str}
-   - CRITICAL: Just type the search term and press Enter
-   - CRITICAL: Do NOT click dropdown suggestions that appear while typing
-   - CRITICAL: Only process emails from the last {config["hours_lookback"]} hours
-   - If no matching emails found, the task is complete - log "No requests found" and finish
-
-4. FOR EACH REQUEST FOUND (process one at a time):
-
-   a. EXTRACT INFORMATION
-      - Open the email
-      - Find the customer's email address (usually in "From" field or email body)
-      - Note any specific details mentioned (amounts, order numbers, etc.)
-   
-   b. GO TO PAYMENT SERVICE ({config["payment_service"]})
-      - Navigate to: {config["payment_url"]}
-      - Log in if needed using:{payment_creds if payment_creds else " (check environment variables)"}
-      - Verify you're logged in
-   
-   c. FIND THE CUSTOMER
-      - Go to the Payments or Customers section
-      - Search for the customer by their email address
-      - Wait for results to load
-      - Verify you found the correct customer (email must match exactly)
-   
-   d. PERFORM THE ACTION
-      - Find the relevant transaction/payment
-      - Click the {config["action_menu"]} menu (usually ⋯ or ...)
-      - Click "{config["action_name"]}"
-      - Confirm the action if prompted
-      - Wait for success confirmation
-      - Take a screenshot to document the action
-   
-   e. RETURN TO EMAIL
-      - Go back to {config["email_service"]}
-      - Process the next request
-
-5. COMPLETION
-   - After all requests are processed, take a final screenshot
-   - Log a summary of actions taken
-   - Your task is complete
-
-{"="*60}
-IMPORTANT RULES
-{"="*60}
-
-- Process requests ONE AT A TIME (not in parallel)
-- Take screenshots after important steps for verification
-- If you encounter an error, take a screenshot and try to recover
-- If a customer is not found, skip and move to the next request
-- If an action was already performed, skip and move to the next
-- Be careful and methodical - accuracy over speed
-
-{f"[DRY RUN MODE] Do NOT actually click action buttons. Instead, take screenshots and describe what you would do." if self.dry_run else ""}
-
-Begin by opening the browser and starting the workflow."""
-
-        return prompt
+        dry_run_note = _DRY_RUN_NOTE if self.dry_run else ""
+        return WORKFLOW_PROMPT.substitute(
+            current_time=current_time,
+            lookback_time=lookback_time,
+            dry_run_note=dry_run_note,
+        )
     
     def run(self):
         """
@@ -265,37 +481,22 @@ Begin by opening the browser and starting the workflow."""
             logger.info("STARTING CUA WORKFLOW")
             logger.info("=" * 60)
             logger.info(f"Dry run mode: {self.dry_run}")
-            logger.info(f"Email service: {WORKFLOW_CONFIG['email_service']}")
-            logger.info(f"Payment service: {WORKFLOW_CONFIG['payment_service']}")
+            logger.info(f"Email service: {WORKFLOW_CONFIG.email_service}")
+            logger.info(f"Payment service: {WORKFLOW_CONFIG.payment_service}")
             
             # Step 1: Connect to cloud computer
             self.initialize_computer()
             
             # Step 2: Build the workflow prompt
             prompt = self.build_workflow_prompt()
-            logger.debug(f"Workflow prompt:\n{prompt}")
-            
-            # Step 3: Define callback to log Claude's actions
-            def progress_callback(event_type, event_data):
-                """Log what Claude is doing in real-time."""
-                if event_type == "text":
-                    logger.info(f"Claude: {event_data}")
-                elif event_type == "tool_use":
-                    action = event_data.get('action', 'unknown')
-                    logger.info(f"Action: {action}")
-                    if 'coordinate' in event_data:
-                        logger.debug(f"  Click at: {event_data['coordinate']}")
-                elif event_type == "thinking":
-                    logger.debug(f"Thinking: {event_data[:200]}...")  # Truncate long thoughts
-                elif event_type == "error":
-                    logger.error(f"Error: {event_data}")
+            logger.debug("Workflow prompt:\n%s", prompt)
             
-            # Step 4: Execute the workflow via Claude
+            # Step 3: Execute the workflow via Claude (progress is logged by _progress_callback)
             logger.info("Sending workflow to Claude...")
             
             messages = self.computer.prompt(
                 prompt,
-                callback=progress_callback,
+                callback=_progress_callback,
                 model="claude-haiku-4-5-20251001",  # Fast and cost-effective
                 display_width=DISPLAY_WIDTH,
                 display_height=DISPLAY_HEIGHT,
@@ -305,7 +506,7 @@ Begin by opening the browser and starting the workflow."""
                 max_tokens=8192,
             )
             
-            # Step 5: Log completion
+            # Step 4: Log completion
             logger.info("=" * 60)
             logger.info("WORKFLOW COMPLETE")
             logger.info("=" * 60)
@@ -344,42 +545,15 @@ def main():
         python cua_agent.py --computer-id X    # Reuse existing computer
         python cua_agent.py --verbose          # Show detailed logs
     """
-    parser = argparse.ArgumentParser(
-        description="CUA Template - Automate browser workflows with Claude",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python cua_agent.py                     Run the workflow
-  python cua_agent.py --dry-run           Test without taking actions  
-  python cua_agent.py --computer-id abc   Reuse existing computer
-  python cua_agent.py --verbose           Show detailed debug logs
-        """
-    )
-    parser.add_argument(
-        "--computer-id",
-        type=str,
-        help="Reuse an existing Orgo computer instance by ID"
-    )
-    parser.add_argument(
-        "--dry-run",
-        action="store_true",
-        help="Run in test mode - describe actions without performing them"
-    )
-    parser.add_argument(
-        "--verbose",
-        action="store_true",
-        help="Enable detailed debug logging"
-    )
-    
-    args = parser.parse_args()
+    computer_id, dry_run, verbose = _parse_args(sys.argv[1:])
     
     # Set logging level
-    if args.verbose:
+    if verbose:
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Verbose logging enabled")
     
     # Create and run the agent
-    agent = CUAAgent(computer_id=args.computer_id, dry_run=args.dry_run)
+    agent = CUAAgent(computer_id=computer_id, dry_run=dry_run)
     
     try:
         agent.run()